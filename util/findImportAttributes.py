@@ -3,8 +3,18 @@ import pprint
 import json
 import re
 import sys
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
 
-cfnclient = boto3.client('cloudformation', region_name = "us-east-1")
+cfnclient = boto3.client('cloudformation', region_name = "us-east-1", config=Config(
+    retries={
+        'mode': 'adaptive',
+        'max_attempts': 10
+    }
+))
+
+import_props_pattern = re.compile(r'Expected \[([a-zA-Z0-9]+)(?:, )?([a-zA-Z0-9]+)?(?:, )?([a-zA-Z0-9]+)?(?:, )?([a-zA-Z0-9]+)?\]')
 
 cfn_types = [
     'AWS::ApiGatewayV2::VpcLink',
@@ -33,7 +43,7 @@ if len(sys.argv) == 2:
         sys.argv[1]
     ]
 
-for cfntype in cfn_types:
+def probe_import_properties(cfntype):
     try:
         cfnclient.create_change_set(
             StackName='importstack',
@@ -54,9 +64,31 @@ for cfntype in cfn_types:
                 },
             ]
         )
-    except Exception as e:
-        p = re.compile('Expected \[([a-zA-Z0-9]+)(?:, )?([a-zA-Z0-9]+)?(?:, )?([a-zA-Z0-9]+)?(?:, )?([a-zA-Z0-9]+)?\]')
-        results = p.findall(str(e))
+    except ClientError as e:
+        # only a validation failure tells us about the import identifiers,
+        # anything else (e.g. throttling that outlasted the retries) is a failed probe
+        if e.response['Error']['Code'] == 'ValidationError':
+            return str(e), None
+        return None, str(e)
+    except BotoCoreError as e:
+        # transport failures (connection errors, read timeouts) are failed probes too
+        return None, str(e)
+    return '', None
+
+failed_types = []
+
+# the probes are latency-bound, so run them concurrently over the shared client;
+# the adaptive retry mode backs the client off when CreateChangeSet throttles
+with ThreadPoolExecutor(max_workers=8) as executor:
+    probe_results = executor.map(probe_import_properties, cfn_types)
+
+    for cfntype, (error, failure) in zip(cfn_types, probe_results):
+        if failure is not None:
+            print("Probe failed for {}: {}".format(cfntype, failure), file=sys.stderr)
+            failed_types.append(cfntype)
+            continue
+
+        results = import_props_pattern.findall(error)
         if len(results) > 0:
             print(cfntype, results[0])
             importprops = list(results[0])
@@ -73,3 +105,7 @@ for cfntype in cfn_types:
 
 print("")
 print(json.dumps(jsonobj, indent=4, sort_keys=True))
+
+if len(failed_types) > 0:
+    print("{} types could not be probed: {}".format(len(failed_types), ", ".join(failed_types)), file=sys.stderr)
+    sys.exit(1)
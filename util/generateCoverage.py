@@ -4,6 +4,7 @@ import pprint
 import math
 import re
 import collections
+import functools
 
 services = None
 cfn_spec = None
@@ -12,6 +13,7 @@ tf_resources = []
 cfn_types = []
 cfn_occurances = []
 tf_occurances = []
+quoted_cfn_types = set()
 cfn_exceptions = {
     'AWS::CloudFormation::CustomResource': 'N/A',
     'AWS::CloudFormation::Macro': 'N/A',
@@ -62,12 +64,17 @@ tf_exceptions = {
     'aws_simpledb_domain': 'N/A'
 }
 
+cfn_type_pattern = re.compile(r'(AWS\:\:[a-zA-Z0-9]+\:\:[a-zA-Z0-9]+)')
+quoted_cfn_type_pattern = re.compile(r'\'([a-zA-Z0-9]+\:\:[a-zA-Z0-9]+\:\:[a-zA-Z0-9]+)\'')
+tf_type_pattern = re.compile(r'terraformType\'\:\ \'(aws(?:\_[a-zA-Z0-9]+)+)\'')
+
 with open("util/cfnspec.json", "r") as f:
-    cfn_spec = json.loads(f.read())['ResourceTypes']
+    loaded_spec = json.loads(f.read())
+    cfn_spec = loaded_spec['ResourceTypes']
 
 with open("util/tf_resources.txt", "r") as f:
-    lines = f.read().splitlines()
-    for line in lines:
+    for line in f:
+        line = line.rstrip("\n")
         if line != "":
             tf_resources.append(line)
 
@@ -76,19 +83,26 @@ for servicefilename in os.listdir("js/services"):
         text = f.read()
         lines = text.splitlines()
         for line in lines:
-            if 'not real resource type' not in line:
-                cfn_occurances += re.compile(r'(AWS\:\:[a-zA-Z0-9]+\:\:[a-zA-Z0-9]+)').findall(line)
-        tf_occurances += re.compile(r'terraformType\'\:\ \'(aws(?:\_[a-zA-Z0-9]+)+)\'').findall(text)
+            if 'AWS::' in line and 'not real resource type' not in line:
+                cfn_occurances += cfn_type_pattern.findall(line)
+        tf_occurances += tf_type_pattern.findall(text)
+        quoted_cfn_types.update(quoted_cfn_type_pattern.findall(text))
+
+cfn_occurances = list(dict.fromkeys(cfn_occurances)) # dedup, keeping discovery order
+tf_occurances = list(dict.fromkeys(tf_occurances))
 
 for cfntype, _ in cfn_spec.items():
     cfn_types.append(cfntype)
 
+cfn_types = set(cfn_types)
+
 for cfn_occurance in cfn_occurances:
     if cfn_occurance not in cfn_types:
         print("Resource not in spec: " + cfn_occurance)
-        cfn_types.append(cfn_occurance)
+        cfn_types.add(cfn_occurance)
 
-cfn_types = set(cfn_types)
+cfn_covered = frozenset(cfn_occurances)
+tf_covered = frozenset(tf_occurances)
 
 ## Property Coverage
 def getProps(resourcetype, propdef, depth):
@@ -128,41 +142,40 @@ def getProps(resourcetype, propdef, depth):
     return ret
 
 spec = {}
-with open("util/cfnspec.json", "r") as f:
-    loaded_spec = json.loads(f.read())
-
-    for k, v in loaded_spec['ResourceTypes'].items():
-        if k not in cfn_exceptions.keys():
-            try:
-                spec[k] = getProps(k, v, 0)
-            except Exception as e:
-                print(e)
+for k, v in cfn_spec.items():
+    if k not in cfn_exceptions.keys():
+        try:
+            spec[k] = getProps(k, v, 0)
+        except Exception as e:
+            print(e)
 
 # Find occurences
+@functools.lru_cache(maxsize=None)
+def read_service_file(servicefilename):
+    with open("js/services/" + servicefilename, "r") as f:
+        return f.read()
+
+servicefilenames = os.listdir("js/services")
+
 def find_occs(resourcetype, prop, indent, subprops):
     ret = ""
-    break_loop = False
     process_subs = True
-    for servicefilename in os.listdir("js/services"):
-        if not break_loop:
-            with open("js/services/" + servicefilename, "r") as f:
-                text = f.read()
-                endpos = text.find("'" + resourcetype + "'")
-                if endpos > -1:
-                    startpos = text.rfind("if (obj.type ==", 0, endpos)
-                    if "\'" + prop + "\'" in text[startpos:endpos]:
-                        ret += (' '*indent) + prop + ": [X]\n"
-                    elif "SKIPPED: " + prop in text[startpos:endpos]:
-                        ret += (' '*indent) + prop + ": [~]\n"
-                        process_subs = False
-                    else:
-                        ret += (' '*indent) + prop + ": [ ]\n"
-                        process_subs = False
-                    break_loop = True
+    for servicefilename in servicefilenames:
+        text = read_service_file(servicefilename)
+        endpos = text.find("'" + resourcetype + "'")
+        if endpos > -1:
+            startpos = text.rfind("if (obj.type ==", 0, endpos)
+            if "\'" + prop + "\'" in text[startpos:endpos]:
+                ret += (' '*indent) + prop + ": [X]\n"
+            elif "SKIPPED: " + prop in text[startpos:endpos]:
+                ret += (' '*indent) + prop + ": [~]\n"
+                process_subs = False
+            else:
+                ret += (' '*indent) + prop + ": [ ]\n"
+                process_subs = False
+            break
     if process_subs:
-        subpropret = ''
-        for k, v in subprops.items():
-            subpropret += find_occs(resourcetype, k, indent + 4, v)
+        subpropret = ''.join(find_occs(resourcetype, k, indent + 4, v) for k, v in subprops.items())
         if "[X]" in subpropret:
             ret += subpropret
         else:
@@ -170,10 +183,11 @@ def find_occs(resourcetype, prop, indent, subprops):
     return ret
 
 for resourcetype, props in spec.items():
-    txt = ''
-    for prop in props.keys():
-        txt += find_occs(resourcetype, prop, 0, props[prop])
-    spec[resourcetype] = txt
+    if resourcetype not in quoted_cfn_types:
+        # find_occs can't match anything for a type no service file mentions
+        spec[resourcetype] = ''
+        continue
+    spec[resourcetype] = ''.join(find_occs(resourcetype, prop, 0, subprops) for prop, subprops in props.items())
 
 ####
 
@@ -184,9 +198,9 @@ with open("RESOURCE_COVERAGE.md", "w") as f:
     f.write("_This page is auto-generated by `util/generateCoverage.py`_\n\n")
     f.write("## CloudFormation Resource Coverage\n\n")
     f.write("**%s/%s (%s%%)** Resources Covered\n" % (
-        len(set(cfn_occurances)) + len(cfn_exceptions),
+        len(cfn_occurances) + len(cfn_exceptions),
         len(cfn_types),
-        int(math.floor((len(set(cfn_occurances)) + len(cfn_exceptions)) * 100 / len(cfn_types)))
+        int(math.floor((len(cfn_occurances) + len(cfn_exceptions)) * 100 / len(cfn_types)))
     ))
 
     f.write("\n| Type | Coverage |\n")
@@ -194,7 +208,7 @@ with open("RESOURCE_COVERAGE.md", "w") as f:
 
     for cfntype in sorted(cfn_types):
         coverage = ""
-        if cfn_occurances.count(cfntype) > 0:
+        if cfntype in cfn_covered:
             coverage = ":thumbsup:"
         if cfntype in cfn_exceptions:
             coverage = cfn_exceptions[cfntype]
@@ -202,9 +216,9 @@ with open("RESOURCE_COVERAGE.md", "w") as f:
 
     f.write("\n## Terraform Coverage\n\n")
     f.write("**%s/%s (%s%%)** Resources Covered\n" % (
-        len(set(tf_occurances)) + len(tf_exceptions),
+        len(tf_occurances) + len(tf_exceptions),
         len(tf_resources),
-        int(math.floor((len(set(tf_occurances)) + len(tf_exceptions)) * 100 / len(tf_resources)))
+        int(math.floor((len(tf_occurances) + len(tf_exceptions)) * 100 / len(tf_resources)))
     ))
     
     f.write("\n| Type | Coverage |\n")
@@ -212,7 +226,7 @@ with open("RESOURCE_COVERAGE.md", "w") as f:
 
     for tf_resource in sorted(tf_resources):
         coverage = ""
-        if tf_occurances.count(tf_resource) > 0:
+        if tf_resource in tf_covered:
             coverage = ":thumbsup:"
         if tf_resource in tf_exceptions:
             coverage = tf_exceptions[tf_resource]